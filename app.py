@@ -6,13 +6,20 @@ using Qwen2.5-VL vision model and generates formatted Word documents.
 import streamlit as st
 from PIL import Image
 import os
+import hashlib
+import html
 import time
+import threading
+from concurrent.futures import Future
+from io import BytesIO
 from pathlib import Path
+from streamlit.errors import StreamlitAPIException
 
 # Import custom utilities
 from utils.image_utils import validate_image, prepare_image_for_model, get_image_dimensions
-from utils.vision_extractor import VisionExtractor, get_available_models, get_model_info, AVAILABLE_MODELS
+from utils.vision_extractor import VisionExtractor, ExtractorRegistry, get_available_models, get_model_info, AVAILABLE_MODELS
 from utils.docx_generator import generate_docx
+from utils.extraction_scheduler import ExtractionScheduler
 
 
 # Page configuration
@@ -24,15 +31,8 @@ st.set_page_config(
 )
 
 
-def load_css():
-    """Load custom CSS styles."""
-    css_path = Path(__file__).parent / "styles" / "custom.css"
-    if css_path.exists():
-        with open(css_path, 'r', encoding='utf-8') as f:
-            st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
-    
-    # Additional inline styles for components
-    st.markdown("""
+# Additional inline styles for components
+_INLINE_CSS = """
     <style>
         @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&family=Outfit:wght@400;500;600;700&display=swap');
         
@@ -61,12 +61,26 @@ def load_css():
             background: rgba(99, 102, 241, 0.7);
         }
     </style>
-    """, unsafe_allow_html=True)
+    """
 
 
-def render_header():
-    """Render the application header."""
-    st.markdown("""
+_CSS_PATH = Path(__file__).parent / "styles" / "custom.css"
+
+
+@st.cache_data(show_spinner=False)
+def _css_markup() -> str:
+    """Read custom.css once per process and combine it with the inline styles."""
+    if not _CSS_PATH.exists():
+        return _INLINE_CSS
+    return f'<style>{_CSS_PATH.read_text(encoding="utf-8")}</style>' + _INLINE_CSS
+
+
+def load_css():
+    """Load custom CSS styles."""
+    st.markdown(_css_markup(), unsafe_allow_html=True)
+
+
+_HEADER_HTML = """
     <div class="title-container" style="text-align: center; padding: 2rem 0;">
         <h1 style="
             font-family: 'Outfit', sans-serif;
@@ -87,101 +101,40 @@ def render_header():
             letter-spacing: 0.02em;
         ">Transform handwritten notes into editable documents with AI</p>
     </div>
-    """, unsafe_allow_html=True)
+    """
+
+
+def render_header():
+    """Render the application header."""
+    st.markdown(_HEADER_HTML, unsafe_allow_html=True)
+
+
+_FEATURE_CARD_HTML = """
+<div class="feature-card">
+    <div class="feature-icon">{icon}</div>
+    <h3 class="feature-title">{title}</h3>
+    <p class="feature-desc">{description}</p>
+</div>
+"""
+
+_FEATURES_HTML = tuple(
+    _FEATURE_CARD_HTML.format(icon=icon, title=title, description=description)
+    for icon, title, description in (
+        ("🔍", "Smart Extraction", "AI-powered text recognition for handwritten notes and diagrams"),
+        ("📝", "Format Preservation", "Maintains headings, lists, tables, and text emphasis"),
+        ("📄", "Word Export", "Download formatted .docx files ready for editing"),
+    )
+)
 
 
 def render_features():
     """Render feature cards using Streamlit columns."""
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.markdown("""
-        <div style="
-            background: rgba(255, 255, 255, 0.05);
-            backdrop-filter: blur(20px);
-            border: 1px solid rgba(255, 255, 255, 0.1);
-            border-radius: 16px;
-            padding: 1.5rem;
-            text-align: center;
-            height: 200px;
-        ">
-            <div style="font-size: 2.5rem; margin-bottom: 0.75rem;">🔍</div>
-            <h3 style="
-                font-family: 'Outfit', sans-serif;
-                font-size: 1.1rem;
-                font-weight: 600;
-                color: #f8fafc;
-                margin-bottom: 0.5rem;
-            ">Smart Extraction</h3>
-            <p style="
-                font-family: 'Inter', sans-serif;
-                font-size: 0.85rem;
-                color: #94a3b8;
-                line-height: 1.5;
-            ">AI-powered text recognition for handwritten notes and diagrams</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown("""
-        <div style="
-            background: rgba(255, 255, 255, 0.05);
-            backdrop-filter: blur(20px);
-            border: 1px solid rgba(255, 255, 255, 0.1);
-            border-radius: 16px;
-            padding: 1.5rem;
-            text-align: center;
-            height: 200px;
-        ">
-            <div style="font-size: 2.5rem; margin-bottom: 0.75rem;">📝</div>
-            <h3 style="
-                font-family: 'Outfit', sans-serif;
-                font-size: 1.1rem;
-                font-weight: 600;
-                color: #f8fafc;
-                margin-bottom: 0.5rem;
-            ">Format Preservation</h3>
-            <p style="
-                font-family: 'Inter', sans-serif;
-                font-size: 0.85rem;
-                color: #94a3b8;
-                line-height: 1.5;
-            ">Maintains headings, lists, tables, and text emphasis</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown("""
-        <div style="
-            background: rgba(255, 255, 255, 0.05);
-            backdrop-filter: blur(20px);
-            border: 1px solid rgba(255, 255, 255, 0.1);
-            border-radius: 16px;
-            padding: 1.5rem;
-            text-align: center;
-            height: 200px;
-        ">
-            <div style="font-size: 2.5rem; margin-bottom: 0.75rem;">📄</div>
-            <h3 style="
-                font-family: 'Outfit', sans-serif;
-                font-size: 1.1rem;
-                font-weight: 600;
-                color: #f8fafc;
-                margin-bottom: 0.5rem;
-            ">Word Export</h3>
-            <p style="
-                font-family: 'Inter', sans-serif;
-                font-size: 0.85rem;
-                color: #94a3b8;
-                line-height: 1.5;
-            ">Download formatted .docx files ready for editing</p>
-        </div>
-        """, unsafe_allow_html=True)
+    for col, card_html in zip(st.columns(3), _FEATURES_HTML):
+        with col:
+            st.markdown(card_html, unsafe_allow_html=True)
 
 
-def render_upload_zone():
-    """Render the file upload zone."""
-    st.markdown("""
+_UPLOAD_HTML = """
     <div style="
         background: linear-gradient(135deg, rgba(99, 102, 241, 0.1) 0%, rgba(139, 92, 246, 0.05) 100%);
         border: 2px dashed rgba(99, 102, 241, 0.4);
@@ -205,12 +158,15 @@ def render_upload_zone():
             margin-top: 0.5rem;
         ">Supports JPG and PNG • Max 10MB</p>
     </div>
-    """, unsafe_allow_html=True)
+    """
 
 
-def render_processing_animation():
-    """Render processing animation."""
-    st.markdown("""
+def render_upload_zone():
+    """Render the file upload zone."""
+    st.markdown(_UPLOAD_HTML, unsafe_allow_html=True)
+
+
+_PROCESSING_HTML = """
     <div style="
         display: flex;
         flex-direction: column;
@@ -224,29 +180,9 @@ def render_processing_animation():
             gap: 0.5rem;
             margin-bottom: 1.5rem;
         ">
-            <div style="
-                width: 12px;
-                height: 12px;
-                background: #6366f1;
-                border-radius: 50%;
-                animation: bounce 1.4s infinite ease-in-out;
-                animation-delay: -0.32s;
-            "></div>
-            <div style="
-                width: 12px;
-                height: 12px;
-                background: #8b5cf6;
-                border-radius: 50%;
-                animation: bounce 1.4s infinite ease-in-out;
-                animation-delay: -0.16s;
-            "></div>
-            <div style="
-                width: 12px;
-                height: 12px;
-                background: #a855f7;
-                border-radius: 50%;
-                animation: bounce 1.4s infinite ease-in-out;
-            "></div>
+            <div class="processing-dot"></div>
+            <div class="processing-dot"></div>
+            <div class="processing-dot"></div>
         </div>
         <p style="
             font-family: 'Inter', sans-serif;
@@ -260,13 +196,12 @@ def render_processing_animation():
             margin-top: 0.5rem;
         ">This may take a moment</p>
     </div>
-    <style>
-        @keyframes bounce {
-            0%, 80%, 100% { transform: scale(0); }
-            40% { transform: scale(1); }
-        }
-    </style>
-    """, unsafe_allow_html=True)
+    """
+
+
+def render_processing_animation():
+    """Render processing animation."""
+    st.markdown(_PROCESSING_HTML, unsafe_allow_html=True)
 
 
 def render_success_message(message: str):
@@ -311,66 +246,109 @@ def render_error_message(message: str):
     """, unsafe_allow_html=True)
 
 
-def get_extractor(model_key: str = "Qwen3-VL-8B"):
-    """Get or create the vision extractor instance for the selected model."""
-    # Create a unique key for each model
-    extractor_key = f'extractor_{model_key}'
+@st.cache_resource(show_spinner=False)
+def _get_registry() -> ExtractorRegistry:
+    """Process-wide registry of loaded extractors, shared by every session."""
+    return ExtractorRegistry()
+
+
+def _get_secrets() -> tuple:
+    """
+    Resolve the API credentials from the environment or Streamlit secrets.
     
-    if extractor_key not in st.session_state:
-        # Check for HuggingFace token safely
-        hf_token = os.environ.get("HF_TOKEN")
-        if not hf_token:
-            try:
-                hf_token = st.secrets.get("HF_TOKEN", None)
-            except Exception:
-                hf_token = None
-        
-        # Check for OpenAI API key safely
-        openai_key = os.environ.get("OPENAI_API_KEY")
-        if not openai_key:
-            try:
-                openai_key = st.secrets.get("OPENAI_API_KEY", None)
-            except Exception:
-                openai_key = None
-        
+    Not cached: it only runs while a model still has to be loaded, and a
+    rotated or newly added key is picked up by the next load attempt.
+    """
+    # Check for HuggingFace token safely
+    hf_token = os.environ.get("HF_TOKEN")
+    if not hf_token:
         try:
-            st.session_state[extractor_key] = VisionExtractor(
-                hf_token=hf_token,
-                openai_key=openai_key,
-                model_key=model_key
-            )
-        except Exception as e:
-            st.session_state[extractor_key] = None
-            st.session_state[f'{extractor_key}_error'] = str(e)
+            hf_token = st.secrets.get("HF_TOKEN", None)
+        except Exception:
+            hf_token = None
+    
+    # Check for OpenAI API key safely
+    openai_key = os.environ.get("OPENAI_API_KEY")
+    if not openai_key:
+        try:
+            openai_key = st.secrets.get("OPENAI_API_KEY", None)
+        except Exception:
+            openai_key = None
     
-    return st.session_state.get(extractor_key)
+    return hf_token, openai_key
+
+
+def get_extractor(model_key: str = "Qwen3-VL-8B"):
+    """Get the shared vision extractor instance for the selected model."""
+    registry = _get_registry()
+    extractor = registry.peek(model_key)
+    if extractor is None:
+        # Credentials are only needed to load a model that isn't loaded yet
+        hf_token, openai_key = _get_secrets()
+        extractor = registry.get(model_key, hf_token=hf_token, openai_key=openai_key)
+    return extractor
+
+
+# Seconds a session waits for its extraction before giving up
+EXTRACTION_TIMEOUT = 120
+
+# Characters of extracted text shown in the result panel
+PREVIEW_CHARS = 2000
+
+# Seconds between polls of an extraction running in the background
+EXTRACTION_POLL_INTERVAL = 0.25
+
+
+@st.cache_resource(show_spinner=False)
+def _get_scheduler() -> ExtractionScheduler:
+    """Process-wide scheduler shared by every session's extraction requests."""
+    return ExtractionScheduler()
+
+
+# Leading underscores keep Streamlit from hashing the extractor, image and
+# chunk buffer; the content hash in `key` already identifies the entry.
+@st.cache_data(max_entries=64, ttl=3600, show_spinner=False)
+def _extract_cached(key: str, _extractor: VisionExtractor, _image: Image.Image, _chunks: list) -> str:
+    """
+    Extract text, shared across sessions for identical uploads and models.
+    On a miss, chunks are appended to `_chunks` as the model streams them.
+    """
+    for chunk in _extractor.extract_text_stream(_image):
+        _chunks.append(chunk)
+    return "".join(_chunks)
+
+
+def _content_key(image_bytes: bytes, model_key: str) -> str:
+    """Identify an extraction by upload content and model."""
+    digest = hashlib.blake2b(image_bytes, digest_size=16)
+    digest.update(model_key.encode())
+    return digest.hexdigest()
 
 
-def process_image(uploaded_file, model_key: str = "Qwen3-VL-8B") -> tuple[str, bool]:
+def process_image(image: Image.Image, content_key: str, chunks: list, model_key: str = "Qwen3-VL-8B") -> tuple[str, bool]:
     """
     Process the uploaded image and extract text.
+    Runs on a scheduler worker thread; see submit_extraction.
     
     Args:
-        uploaded_file: The uploaded image file
+        image: The uploaded image, already prepared with prepare_image_for_model
+        content_key: Result of _content_key for the upload and model
+        chunks: List that receives the text as it streams in, for display
         model_key: The model to use for extraction
     
     Returns:
         Tuple of (extracted_text, success)
     """
     try:
-        # Prepare image
-        image, _ = prepare_image_for_model(uploaded_file)
-        
         # Get extractor for selected model
         extractor = get_extractor(model_key)
         
         if extractor is None:
-            error_key = f'extractor_{model_key}_error'
-            error_msg = st.session_state.get(error_key, 'Vision extractor not available')
+            error_msg = _get_registry().get_error(model_key) or 'Vision extractor not available'
             return f"Error: {error_msg}", False
         
-        # Extract text
-        extracted_text = extractor.extract_text(image)
+        # Extract text, reusing a previous result for the same upload and model
+        extracted_text = _extract_cached(content_key, extractor, image, chunks)
         
         return extracted_text, True
         
@@ -378,6 +356,284 @@ def process_image(uploaded_file, model_key: str = "Qwen3-VL-8B") -> tuple[str, b
         return f"Error processing image: {str(e)}", False
 
 
+@st.cache_data(max_entries=64, show_spinner=False)
+def _build_docx(text: str, title: str) -> bytes:
+    """Generate the Word document once per distinct text and title."""
+    return generate_docx(text, title=title).getvalue()
+
+
+def build_preview(text: str) -> str:
+    """Truncate and HTML-escape extracted text once, for the result panel."""
+    preview = html.escape(text[:PREVIEW_CHARS], quote=False)
+    return preview + ('...' if len(text) > PREVIEW_CHARS else '')
+
+
+def submit_extraction(image: Image.Image, image_bytes: bytes, model_key: str) -> tuple[Future, list]:
+    """
+    Start process_image on the shared scheduler without blocking the script.
+    
+    Returns:
+        Tuple of (future, chunks): the Future resolves to process_image's
+        (extracted_text, success) tuple, and chunks fills with the text as
+        it streams in. A request that joins an identical pending one shares
+        its result but not its chunks, so its list stays empty.
+    """
+    content_key = _content_key(image_bytes, model_key)
+    chunks = []
+    future = _get_scheduler().submit(content_key, process_image, image, content_key, chunks, model_key)
+    return future, chunks
+
+
+_IMAGE_CARD_HTML = """
+            <div style="
+                background: rgba(255, 255, 255, 0.05);
+                border: 1px solid rgba(255, 255, 255, 0.1);
+                border-radius: 16px;
+                padding: 1.5rem;
+                margin-top: 1rem;
+            ">
+                <div style="
+                    display: flex;
+                    align-items: center;
+                    gap: 0.75rem;
+                    margin-bottom: 1rem;
+                    padding-bottom: 0.75rem;
+                    border-bottom: 1px solid rgba(255, 255, 255, 0.1);
+                ">
+                    <span style="font-size: 1.25rem;">🖼️</span>
+                    <span style="
+                        font-family: 'Outfit', sans-serif;
+                        font-size: 1rem;
+                        font-weight: 600;
+                        color: #f8fafc;
+                    ">Original Image</span>
+                </div>
+            """
+
+_TEXT_CARD_HTML = """
+            <div style="
+                background: rgba(255, 255, 255, 0.05);
+                border: 1px solid rgba(255, 255, 255, 0.1);
+                border-radius: 16px;
+                padding: 1.5rem;
+                margin-top: 1rem;
+            ">
+                <div style="
+                    display: flex;
+                    align-items: center;
+                    gap: 0.75rem;
+                    margin-bottom: 1rem;
+                    padding-bottom: 0.75rem;
+                    border-bottom: 1px solid rgba(255, 255, 255, 0.1);
+                ">
+                    <span style="font-size: 1.25rem;">📝</span>
+                    <span style="
+                        font-family: 'Outfit', sans-serif;
+                        font-size: 1rem;
+                        font-weight: 600;
+                        color: #f8fafc;
+                    ">Extracted Text</span>
+                </div>
+            """
+
+_TEXT_PREVIEW_HTML = """
+        <div style="
+            font-family: 'Inter', sans-serif;
+            font-size: 0.9rem;
+            color: #94a3b8;
+            line-height: 1.7;
+            max-height: 400px;
+            overflow-y: auto;
+            padding-right: 0.5rem;
+            white-space: pre-wrap;
+        ">{preview}</div>
+        """
+
+
+def _finish_extraction():
+    """Forget the background extraction once it has been handled."""
+    st.session_state.extraction = None
+    st.session_state.processing = False
+
+
+def _start_extraction(image: Image.Image, image_bytes: bytes):
+    """Submit the extraction from the Extract button, before the panel is drawn."""
+    st.session_state.processing = True
+    st.session_state.extraction, st.session_state.extraction_chunks = submit_extraction(
+        image, image_bytes, st.session_state.selected_model
+    )
+    st.session_state.extraction_started = time.monotonic()
+
+
+def _cancel_extraction():
+    """Drop the pending extraction from the Cancel button."""
+    st.session_state.extraction.cancel()
+    _finish_extraction()
+
+
+def _poll_extraction():
+    """Collect the background extraction if it has finished or timed out."""
+    extraction = st.session_state.extraction
+    if extraction.done():
+        extracted_text, success = extraction.result()
+        if success:
+            st.session_state.extracted_text_full = extracted_text
+            st.session_state.extracted_text_preview = build_preview(extracted_text)
+        else:
+            st.session_state.extraction_error = extracted_text
+        _finish_extraction()
+    elif time.monotonic() - st.session_state.extraction_started > EXTRACTION_TIMEOUT:
+        extraction.cancel()
+        st.session_state.extraction_error = f"Extraction did not finish within {EXTRACTION_TIMEOUT} seconds"
+        _finish_extraction()
+
+
+def _rerun_extract_fragment():
+    """Poll again after EXTRACTION_POLL_INTERVAL by rerunning only this fragment."""
+    time.sleep(EXTRACTION_POLL_INTERVAL)
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        # A full run drew the panel, and only a fragment rerun may rerun
+        # itself; the next rerun picks the polling back up
+        pass
+
+
+@st.fragment
+def _extract_fragment(image: Image.Image, image_bytes: bytes):
+    """
+    Render the extract button, result panel and download button.
+    
+    Runs as a fragment, so clicking Extract and downloading only rerun this
+    part of the page. A finished extraction is collected before anything is
+    drawn, so the pass that picks it up also shows the result; while one is
+    pending the fragment polls by rerunning itself, never the whole app.
+    """
+    # Collect a finished extraction before the result panel is drawn
+    if st.session_state.extraction is not None:
+        _poll_extraction()
+    
+    st.markdown(_TEXT_CARD_HTML, unsafe_allow_html=True)
+    
+    # Extract button, disabled while an extraction is pending
+    st.button(
+        "🚀 Extract Text",
+        use_container_width=True,
+        type="primary",
+        disabled=st.session_state.processing,
+        on_click=_start_extraction,
+        args=(image, image_bytes)
+    )
+    
+    # Report a failed or timed-out extraction once
+    if st.session_state.extraction_error:
+        render_error_message(st.session_state.extraction_error)
+        st.session_state.extraction_error = None
+    
+    extraction = st.session_state.extraction
+    if extraction is not None:
+        # Show the text streamed so far, or the animation until the first chunk
+        partial_text = "".join(st.session_state.extraction_chunks)
+        if partial_text:
+            st.markdown(_TEXT_PREVIEW_HTML.format(preview=build_preview(partial_text)), unsafe_allow_html=True)
+        else:
+            render_processing_animation()
+        st.button("✖ Cancel", use_container_width=True, on_click=_cancel_extraction)
+    # Display extracted text if available
+    elif st.session_state.extracted_text_full:
+        st.markdown(
+            _TEXT_PREVIEW_HTML.format(preview=st.session_state.extracted_text_preview),
+            unsafe_allow_html=True
+        )
+        
+        render_success_message("Text extracted successfully!")
+    else:
+        st.markdown("""
+        <p style="
+            font-family: 'Inter', sans-serif;
+            font-size: 0.9rem;
+            color: #64748b;
+            text-align: center;
+            padding: 2rem;
+        ">Click "Extract Text" to begin processing</p>
+        """, unsafe_allow_html=True)
+    
+    st.markdown("</div>", unsafe_allow_html=True)
+    
+    # Download section, hidden while a new extraction is pending
+    if st.session_state.extraction is None and st.session_state.extracted_text_full:
+        st.markdown("<br>", unsafe_allow_html=True)
+        
+        # Generate document (cached, so reruns don't rebuild it)
+        try:
+            doc_bytes = _build_docx(
+                st.session_state.extracted_text_full,
+                title="Extracted Document"
+            )
+            st.download_button(
+                label="📥 Download Word Document",
+                data=doc_bytes,
+                file_name="extracted_document.docx",
+                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                use_container_width=True
+            )
+        except Exception as e:
+            render_error_message(f"Error generating document: {str(e)}")
+    
+    if st.session_state.extraction is not None:
+        _rerun_extract_fragment()
+
+
+def render_model_status():
+    """Show which vision models are currently loaded, in the sidebar."""
+    loaded = _get_registry().loaded_models()
+    with st.sidebar:
+        st.markdown("**🔥 Loaded models**")
+        if loaded:
+            for model_key in reversed(loaded):
+                st.markdown(f"- {get_model_info(model_key)['name']}")
+        else:
+            st.caption("No models loaded yet")
+
+
+def _on_model_change():
+    """Record the newly selected model before the rerun starts."""
+    st.session_state.selected_model = st.session_state.model_selector
+
+
+@st.fragment
+def _model_selector_fragment():
+    """
+    Render the model dropdown and the selected model's description.
+    
+    Runs as a fragment, so changing the model only reruns the selector.
+    """
+    model_options = get_available_models()
+    model_col1, model_col2 = st.columns([2, 3])
+    
+    with model_col1:
+        st.selectbox(
+            "Vision Model",
+            options=model_options,
+            index=model_options.index(st.session_state.selected_model) if st.session_state.selected_model in model_options else 0,
+            label_visibility="collapsed",
+            key="model_selector",
+            on_change=_on_model_change
+        )
+    
+    with model_col2:
+        model_info = get_model_info(st.session_state.selected_model)
+        st.markdown(f"""
+        <p style="
+            font-family: 'Inter', sans-serif;
+            font-size: 0.9rem;
+            color: #94a3b8;
+            margin: 0;
+            padding: 0.5rem 0;
+        ">💡 {model_info['description']}</p>
+        """, unsafe_allow_html=True)
+
+
 def main():
     """Main application entry point."""
     # Load CSS
@@ -387,15 +643,34 @@ def main():
     render_header()
     
     # Initialize session state
-    if 'extracted_text' not in st.session_state:
-        st.session_state.extracted_text = None
+    if 'extracted_text_full' not in st.session_state:
+        st.session_state.extracted_text_full = None
+        st.session_state.extracted_text_preview = None
     if 'uploaded_image' not in st.session_state:
         st.session_state.uploaded_image = None
     if 'processing' not in st.session_state:
         st.session_state.processing = False
+    if 'extraction' not in st.session_state:
+        st.session_state.extraction = None
+        st.session_state.extraction_started = None
+        st.session_state.extraction_chunks = []
+        st.session_state.extraction_error = None
     if 'selected_model' not in st.session_state:
         st.session_state.selected_model = "Qwen3-VL-8B"
     
+    # Build the selected extractor (client and backend import) in the background
+    # so the first click doesn't wait on it
+    if 'prebuild_started' not in st.session_state:
+        st.session_state.prebuild_started = True
+        threading.Thread(
+            target=get_extractor,
+            args=(st.session_state.selected_model,),
+            daemon=True
+        ).start()
+    
+    # Loaded models overview
+    render_model_status()
+    
     # Render features
     render_features()
     
@@ -432,30 +707,7 @@ def main():
     """, unsafe_allow_html=True)
     
     # Model selector dropdown
-    model_options = get_available_models()
-    model_col1, model_col2 = st.columns([2, 3])
-    
-    with model_col1:
-        selected_model = st.selectbox(
-            "Vision Model",
-            options=model_options,
-            index=model_options.index(st.session_state.selected_model) if st.session_state.selected_model in model_options else 0,
-            label_visibility="collapsed",
-            key="model_selector"
-        )
-        st.session_state.selected_model = selected_model
-    
-    with model_col2:
-        model_info = get_model_info(selected_model)
-        st.markdown(f"""
-        <p style="
-            font-family: 'Inter', sans-serif;
-            font-size: 0.9rem;
-            color: #94a3b8;
-            margin: 0;
-            padding: 0.5rem 0;
-        ">💡 {model_info['description']}</p>
-        """, unsafe_allow_html=True)
+    _model_selector_fragment()
     
     # File uploader
     render_upload_zone()
@@ -470,45 +722,34 @@ def main():
     
     # Process uploaded file
     if uploaded_file is not None:
-        # Store uploaded image
-        st.session_state.uploaded_image = uploaded_file
+        # Read, decode, prepare and thumbnail only when a new file is uploaded;
+        # later reruns reuse the bytes, dimensions and images kept in session state
+        if st.session_state.get('preview_file_id') != uploaded_file.file_id:
+            image_bytes = uploaded_file.getvalue()
+            source_image = Image.open(BytesIO(image_bytes))
+            # Image.open only parses the header, so the size is known before decoding
+            st.session_state.image_dims = get_image_dimensions(source_image)
+            image, _ = prepare_image_for_model(source_image)
+            preview = image.copy()
+            preview.thumbnail((768, 768), Image.Resampling.BILINEAR)
+            st.session_state.image_bytes = image_bytes
+            st.session_state.uploaded_image = image
+            st.session_state.preview_image = preview
+            st.session_state.preview_file_id = uploaded_file.file_id
+        image = st.session_state.uploaded_image
+        image_bytes = st.session_state.image_bytes
+        dims = st.session_state.image_dims
         
         # Create columns for preview
         col1, col2 = st.columns(2)
         
         with col1:
-            st.markdown("""
-            <div style="
-                background: rgba(255, 255, 255, 0.05);
-                border: 1px solid rgba(255, 255, 255, 0.1);
-                border-radius: 16px;
-                padding: 1.5rem;
-                margin-top: 1rem;
-            ">
-                <div style="
-                    display: flex;
-                    align-items: center;
-                    gap: 0.75rem;
-                    margin-bottom: 1rem;
-                    padding-bottom: 0.75rem;
-                    border-bottom: 1px solid rgba(255, 255, 255, 0.1);
-                ">
-                    <span style="font-size: 1.25rem;">🖼️</span>
-                    <span style="
-                        font-family: 'Outfit', sans-serif;
-                        font-size: 1rem;
-                        font-weight: 600;
-                        color: #f8fafc;
-                    ">Original Image</span>
-                </div>
-            """, unsafe_allow_html=True)
+            st.markdown(_IMAGE_CARD_HTML, unsafe_allow_html=True)
             
             # Display image
-            image = Image.open(uploaded_file)
-            st.image(image, use_container_width=True)
+            st.image(st.session_state.preview_image, width=512)
             
             # Show image info
-            dims = get_image_dimensions(image)
             st.markdown(f"""
                 <p style="
                     font-family: 'Inter', sans-serif;
@@ -520,105 +761,13 @@ def main():
             """, unsafe_allow_html=True)
         
         with col2:
-            st.markdown("""
-            <div style="
-                background: rgba(255, 255, 255, 0.05);
-                border: 1px solid rgba(255, 255, 255, 0.1);
-                border-radius: 16px;
-                padding: 1.5rem;
-                margin-top: 1rem;
-            ">
-                <div style="
-                    display: flex;
-                    align-items: center;
-                    gap: 0.75rem;
-                    margin-bottom: 1rem;
-                    padding-bottom: 0.75rem;
-                    border-bottom: 1px solid rgba(255, 255, 255, 0.1);
-                ">
-                    <span style="font-size: 1.25rem;">📝</span>
-                    <span style="
-                        font-family: 'Outfit', sans-serif;
-                        font-size: 1rem;
-                        font-weight: 600;
-                        color: #f8fafc;
-                    ">Extracted Text</span>
-                </div>
-            """, unsafe_allow_html=True)
-            
-            # Extract button
-            if st.button("🚀 Extract Text", use_container_width=True, type="primary"):
-                st.session_state.processing = True
-                
-                with st.spinner(""):
-                    render_processing_animation()
-                    
-                    # Reset file position
-                    uploaded_file.seek(0)
-                    
-                    # Process image with selected model
-                    extracted_text, success = process_image(uploaded_file, st.session_state.selected_model)
-                    
-                    if success:
-                        st.session_state.extracted_text = extracted_text
-                        st.session_state.processing = False
-                        st.rerun()
-                    else:
-                        st.session_state.processing = False
-                        render_error_message(extracted_text)
-            
-            # Display extracted text if available
-            if st.session_state.extracted_text:
-                st.markdown(f"""
-                <div style="
-                    font-family: 'Inter', sans-serif;
-                    font-size: 0.9rem;
-                    color: #94a3b8;
-                    line-height: 1.7;
-                    max-height: 400px;
-                    overflow-y: auto;
-                    padding-right: 0.5rem;
-                    white-space: pre-wrap;
-                ">{st.session_state.extracted_text[:2000]}{'...' if len(st.session_state.extracted_text) > 2000 else ''}</div>
-                """, unsafe_allow_html=True)
-                
-                render_success_message("Text extracted successfully!")
-            else:
-                st.markdown("""
-                <p style="
-                    font-family: 'Inter', sans-serif;
-                    font-size: 0.9rem;
-                    color: #64748b;
-                    text-align: center;
-                    padding: 2rem;
-                ">Click "Extract Text" to begin processing</p>
-                """, unsafe_allow_html=True)
-            
-            st.markdown("</div>", unsafe_allow_html=True)
-        
-        # Download section
-        if st.session_state.extracted_text:
-            st.markdown("<br>", unsafe_allow_html=True)
-            
-            # Generate document
-            try:
-                doc_buffer = generate_docx(
-                    st.session_state.extracted_text,
-                    title="Extracted Document"
-                )
-                
-                col1, col2, col3 = st.columns([1, 2, 1])
-                with col2:
-                    st.download_button(
-                        label="📥 Download Word Document",
-                        data=doc_buffer,
-                        file_name="extracted_document.docx",
-                        mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                        use_container_width=True
-                    )
-                    
-            except Exception as e:
-                render_error_message(f"Error generating document: {str(e)}")
+            _extract_fragment(image, image_bytes)
+    
+    elif st.session_state.extraction is not None:
+        # The upload was removed while its extraction was still running
+        st.session_state.extraction.cancel()
+        st.session_state.extraction = None
+        st.session_state.processing = False
     
     # Footer
     st.markdown("""
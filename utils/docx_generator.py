@@ -11,14 +11,50 @@ import re
 from io import BytesIO
 
 
+# Patterns used while converting each line, compiled once
+_NUM_LIST_RE = re.compile(r'^\d+\.\s')
+_DIAGRAM_RE = re.compile(r'\[DIAGRAM:\s*(.*?)\]')
+_TABLE_SEP_RE = re.compile(r'^[\s|:-]+$')
+# Splits text on **bold**, *italic* and $formula$ spans
+_FMT_SPLIT_RE = re.compile(r'(\*\*.*?\*\*|\*[^*]+\*|\$.*?\$)')
+
+# Sizes and colours used while building documents, created once
+_PT_8 = Pt(8)
+_PT_10 = Pt(10)
+_PT_11 = Pt(11)
+_INCH_HALF = Inches(0.5)
+_COLOR_HEADING = RGBColor(30, 64, 175)  # Deep blue
+_COLOR_SEPARATOR = RGBColor(200, 200, 200)
+_COLOR_FORMULA = RGBColor(139, 92, 246)  # Purple
+_COLOR_QUOTE = RGBColor(99, 102, 241)  # Indigo
+_COLOR_DIAGRAM = RGBColor(16, 185, 129)  # Emerald
+_COLOR_CAPTION = RGBColor(100, 100, 100)
+
+# Line markers mapped to (block type, heading level, marker length). Lines
+# are stripped, so a marker only matches a slice of exactly its own length.
+_LINE_PREFIXES = {
+    '### ': ('heading', 2, 4),
+    '## ': ('heading', 1, 3),
+    '# ': ('heading', 0, 2),
+    '- ': ('bullet', None, 2),
+    '• ': ('bullet', None, 2),
+    '> ': ('quote', None, 2),
+}
+
+
 class DocxGenerator:
     """
     Generate formatted Word documents from extracted text.
     """
     
+    # Saved blank document with the custom styles applied; see _get_template
+    _template = None
+    
     def __init__(self):
         """Initialize the document generator."""
         self.document = None
+        self._style_numbered = None
+        self._style_bullet = None
     
     def create_document(self, extracted_text: str, title: str = "Extracted Document") -> BytesIO:
         """
@@ -31,10 +67,13 @@ class DocxGenerator:
         Returns:
             BytesIO object containing the .docx file
         """
-        self.document = Document()
+        # Start from the pre-styled template instead of restyling a fresh document
+        self.document = Document(BytesIO(self._get_template()))
         
-        # Set up document styles
-        self._setup_styles()
+        # Resolve the list styles once per document instead of by name per item
+        styles = self.document.styles
+        self._style_numbered = styles['List Number']
+        self._style_bullet = styles['List Bullet']
         
         # Add title
         title_para = self.document.add_heading(title, level=0)
@@ -53,6 +92,18 @@ class DocxGenerator:
         
         return doc_buffer
     
+    @classmethod
+    def _get_template(cls) -> bytes:
+        """Build the styled blank document once per process and return its bytes."""
+        if cls._template is None:
+            generator = cls()
+            generator.document = Document()
+            generator._setup_styles()
+            template_buffer = BytesIO()
+            generator.document.save(template_buffer)
+            cls._template = template_buffer.getvalue()
+        return cls._template
+    
     def _setup_styles(self):
         """Set up custom document styles."""
         styles = self.document.styles
@@ -61,101 +112,79 @@ class DocxGenerator:
         style = styles['Normal']
         font = style.font
         font.name = 'Calibri'
-        font.size = Pt(11)
+        font.size = _PT_11
         
         # Customize Heading styles
-        for i in range(1, 4):
-            style = styles[f'Heading {i}']
+        for name in ('Heading 1', 'Heading 2', 'Heading 3'):
+            style = styles[name]
             font = style.font
             font.name = 'Calibri'
             font.bold = True
-            font.color.rgb = RGBColor(30, 64, 175)  # Deep blue
+            font.color.rgb = _COLOR_HEADING
     
     def _add_separator(self):
         """Add a horizontal separator line."""
         paragraph = self.document.add_paragraph()
         paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
         run = paragraph.add_run('─' * 50)
-        run.font.color.rgb = RGBColor(200, 200, 200)
-        run.font.size = Pt(8)
+        run.font.color.rgb = _COLOR_SEPARATOR
+        run.font.size = _PT_8
     
     def _process_content(self, text: str):
         """Process extracted text and add formatted content to document."""
-        lines = text.split('\n')
+        lines = text.splitlines()
         current_list_type = None
         list_items = []
         
+        def flush():
+            """Add any pending list items to the document."""
+            nonlocal current_list_type, list_items
+            if list_items:
+                self._add_list(list_items, current_list_type)
+                list_items = []
+                current_list_type = None
+        
         i = 0
         while i < len(lines):
             line = lines[i].strip()
             
             if not line:
                 # Empty line - process any pending list
-                if list_items:
-                    self._add_list(list_items, current_list_type)
-                    list_items = []
-                    current_list_type = None
+                flush()
                 i += 1
                 continue
             
-            # Main heading (##)
-            if line.startswith('## ') and not line.startswith('### '):
-                if list_items:
-                    self._add_list(list_items, current_list_type)
-                    list_items = []
-                    current_list_type = None
-                self._add_heading(line[3:], level=1)
-            
-            # Subheading (###)
-            elif line.startswith('### '):
-                if list_items:
-                    self._add_list(list_items, current_list_type)
-                    list_items = []
-                    current_list_type = None
-                self._add_heading(line[4:], level=2)
-            
-            # Top-level heading (#)
-            elif line.startswith('# ') and not line.startswith('## '):
-                if list_items:
-                    self._add_list(list_items, current_list_type)
-                    list_items = []
-                    current_list_type = None
-                self._add_heading(line[2:], level=0)
-            
-            # Bullet point
-            elif line.startswith('- ') or line.startswith('• '):
-                current_list_type = 'bullet'
-                list_items.append(line[2:])
+            # Headings, bullets and blockquotes, by their leading marker
+            block = (_LINE_PREFIXES.get(line[:4])
+                     or _LINE_PREFIXES.get(line[:3])
+                     or _LINE_PREFIXES.get(line[:2]))
+            if block is not None:
+                block_type, level, marker_len = block
+                if block_type == 'bullet':
+                    current_list_type = 'bullet'
+                    list_items.append(line[marker_len:])
+                else:
+                    flush()
+                    if block_type == 'heading':
+                        self._add_heading(line[marker_len:], level=level)
+                    else:
+                        self._add_blockquote(line[marker_len:])
             
             # Numbered list
-            elif re.match(r'^\d+\.\s', line):
+            elif _NUM_LIST_RE.match(line):
                 current_list_type = 'numbered'
-                list_items.append(re.sub(r'^\d+\.\s', '', line))
-            
-            # Blockquote
-            elif line.startswith('> '):
-                if list_items:
-                    self._add_list(list_items, current_list_type)
-                    list_items = []
-                    current_list_type = None
-                self._add_blockquote(line[2:])
+                list_items.append(_NUM_LIST_RE.sub('', line))
             
             # Diagram marker
             elif '[DIAGRAM:' in line:
-                if list_items:
-                    self._add_list(list_items, current_list_type)
-                    list_items = []
-                    current_list_type = None
-                diagram_match = re.search(r'\[DIAGRAM:\s*(.*?)\]', line)
+                flush()
+                diagram_match = _DIAGRAM_RE.search(line)
                 if diagram_match:
                     self._add_diagram_placeholder(diagram_match.group(1))
             
-            # Table (detect by pipe characters)
-            elif '|' in line and line.count('|') >= 2:
-                if list_items:
-                    self._add_list(list_items, current_list_type)
-                    list_items = []
-                    current_list_type = None
+            # Table (detect by pipe characters; the search stops at the second one)
+            elif line.find('|', line.find('|') + 1) != -1:
+                flush()
                 # Collect table lines
                 table_lines = [line]
                 j = i + 1
@@ -167,17 +196,13 @@ class DocxGenerator:
             
             # Regular paragraph
             else:
-                if list_items:
-                    self._add_list(list_items, current_list_type)
-                    list_items = []
-                    current_list_type = None
+                flush()
                 self._add_paragraph(line)
             
             i += 1
         
         # Process any remaining list items
-        if list_items:
-            self._add_list(list_items, current_list_type)
+        flush()
     
     def _add_heading(self, text: str, level: int):
         """Add a heading to the document."""
@@ -190,9 +215,13 @@ class DocxGenerator:
     
     def _add_formatted_text(self, paragraph, text: str):
         """Add text to a paragraph with bold/italic formatting."""
-        # Pattern to match **bold** and *italic*
-        pattern = r'(\*\*.*?\*\*|\*[^*]+\*|\$.*?\$)'
-        parts = re.split(pattern, text)
+        # Without any marker characters the split can't match; add the text as one run
+        if '*' not in text and '$' not in text:
+            if text:
+                paragraph.add_run(text)
+            return
+        
+        parts = _FMT_SPLIT_RE.split(text)
         
         for part in parts:
             if not part:
@@ -210,28 +239,26 @@ class DocxGenerator:
                 # Formula/equation - use italic and different color
                 run = paragraph.add_run(part[1:-1])
                 run.italic = True
-                run.font.color.rgb = RGBColor(139, 92, 246)  # Purple for formulas
+                run.font.color.rgb = _COLOR_FORMULA
             else:
                 # Regular text
                 paragraph.add_run(part)
     
     def _add_list(self, items: list, list_type: str):
         """Add a bulleted or numbered list."""
+        style = self._style_numbered if list_type == 'numbered' else self._style_bullet
         for item in items:
-            if list_type == 'numbered':
-                paragraph = self.document.add_paragraph(style='List Number')
-            else:
-                paragraph = self.document.add_paragraph(style='List Bullet')
+            paragraph = self.document.add_paragraph(style=style)
             self._add_formatted_text(paragraph, item)
     
     def _add_blockquote(self, text: str):
         """Add a styled blockquote."""
         paragraph = self.document.add_paragraph()
-        paragraph.paragraph_format.left_indent = Inches(0.5)
+        paragraph.paragraph_format.left_indent = _INCH_HALF
         
         # Add left border effect using background
         run = paragraph.add_run('│ ')
-        run.font.color.rgb = RGBColor(99, 102, 241)  # Indigo
+        run.font.color.rgb = _COLOR_QUOTE
         run.bold = True
         
         self._add_formatted_text(paragraph, text)
@@ -244,17 +271,17 @@ class DocxGenerator:
         # Create a styled box for diagram
         run = paragraph.add_run('📊 DIAGRAM')
         run.bold = True
-        run.font.color.rgb = RGBColor(16, 185, 129)  # Emerald
+        run.font.color.rgb = _COLOR_DIAGRAM
         
         paragraph = self.document.add_paragraph()
         paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        paragraph.paragraph_format.left_indent = Inches(0.5)
-        paragraph.paragraph_format.right_indent = Inches(0.5)
+        paragraph.paragraph_format.left_indent = _INCH_HALF
+        paragraph.paragraph_format.right_indent = _INCH_HALF
         
         run = paragraph.add_run(description)
         run.italic = True
-        run.font.size = Pt(10)
-        run.font.color.rgb = RGBColor(100, 100, 100)
+        run.font.size = _PT_10
+        run.font.color.rgb = _COLOR_CAPTION
     
     def _add_table_from_markdown(self, table_lines: list):
         """Parse markdown table and add to document."""
@@ -265,7 +292,7 @@ class DocxGenerator:
         rows = []
         for line in table_lines:
             # Skip separator lines (----)
-            if re.match(r'^[\s|:-]+$', line):
+            if _TABLE_SEP_RE.match(line):
                 continue
             cells = [cell.strip() for cell in line.split('|') if cell.strip()]
             if cells:
@@ -281,16 +308,15 @@ class DocxGenerator:
         table = self.document.add_table(rows=len(rows), cols=num_cols)
         table.style = 'Table Grid'
         
-        # Fill in cells
-        for i, row in enumerate(rows):
-            for j, cell_text in enumerate(row):
-                if j < num_cols:
-                    cell = table.rows[i].cells[j]
-                    # First row is header
-                    if i == 0:
-                        cell.paragraphs[0].add_run(cell_text).bold = True
-                    else:
-                        cell.paragraphs[0].add_run(cell_text)
+        # Fill in cells, reading each row's cells once rather than once per cell
+        for i, (table_row, row) in enumerate(zip(table.rows, rows)):
+            for cell, cell_text in zip(table_row.cells, row):
+                paragraph = cell.paragraphs[0]
+                # First row is header
+                if i == 0:
+                    paragraph.add_run(cell_text).bold = True
+                else:
+                    paragraph.add_run(cell_text)
         
         # Add spacing after table
         self.document.add_paragraph()
@@ -0,0 +1,67 @@
+"""
+Shared scheduling of extraction requests across Streamlit sessions.
+"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class ExtractionScheduler:
+    """
+    Run extraction requests from every session on one bounded pool.
+
+    Requests that share a key (same upload and model) with a call already
+    queued or running join that call instead of starting a new one; distinct
+    calls run concurrently on up to `max_workers` threads.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_workers: Maximum number of calls running at the same time.
+        """
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="extract")
+
+    def submit(self, key: str, fn, *args) -> Future:
+        """
+        Start `fn(*args)` and return a Future for its result.
+
+        Requests with the same key as a pending call share its result. The
+        returned Future can be cancelled until that call completes.
+        """
+        future = Future()
+        with self._lock:
+            if key in self._inflight:
+                self._inflight[key].append(future)
+                return future
+            self._inflight[key] = [future]
+
+        self._executor.submit(self._run, key, fn, args)
+        return future
+
+    def _run(self, key: str, fn, args: tuple):
+        """Run one call and resolve every future still waiting on it."""
+        with self._lock:
+            # Skip the call entirely if every waiter gave up while it was queued
+            if all(future.cancelled() for future in self._inflight[key]):
+                del self._inflight[key]
+                return
+
+        try:
+            result, error = fn(*args), None
+        except Exception as e:
+            result, error = None, e
+
+        with self._lock:
+            futures = self._inflight.pop(key)
+
+        for future in futures:
+            if not future.set_running_or_notify_cancel():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
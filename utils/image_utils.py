@@ -8,54 +8,104 @@ import re
 
 
 def validate_image(file) -> bool:
-    """Validate that the uploaded file is a valid JPG or PNG image."""
+    """
+    Validate that the uploaded file is a valid JPG or PNG image.
+    Checks the file's structure without decoding pixels and rewinds it afterwards.
+    """
     try:
-        img = Image.open(file)
-        return img.format in ['JPEG', 'PNG', 'JPG']
+        with Image.open(file) as img:
+            if img.format not in ('JPEG', 'PNG'):
+                return False
+            img.verify()
+            return True
     except Exception:
         return False
+    finally:
+        # Let the caller read the file again from the start
+        if hasattr(file, 'seek'):
+            file.seek(0)
+
+
+# Images up to this much over max_size are sent as they are
+RESIZE_TOLERANCE = 0.05
+
+# Downscales milder than this use BILINEAR; stronger ones keep LANCZOS
+BILINEAR_MIN_SCALE = 0.67
 
 
 def resize_image_for_api(image: Image.Image, max_size: int = 1024) -> Image.Image:
     """
     Resize image to optimal size for API processing.
-    Maintains aspect ratio while ensuring longest side doesn't exceed max_size.
+    Maintains aspect ratio while ensuring longest side doesn't exceed max_size
+    (by more than RESIZE_TOLERANCE). The image passed in is left unchanged.
     """
     width, height = image.size
+    longest = max(width, height)
     
-    if width <= max_size and height <= max_size:
+    if longest <= max_size * (1 + RESIZE_TOLERANCE):
         return image
     
+    scale = max_size / longest
     if width > height:
         new_width = max_size
-        new_height = int(height * (max_size / width))
+        new_height = int(height * scale)
     else:
         new_height = max_size
-        new_width = int(width * (max_size / height))
+        new_width = int(width * scale)
     
-    return image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+    # A small downscale gains nothing visible from LANCZOS's wider kernel
+    if scale > BILINEAR_MIN_SCALE:
+        resample = Image.Resampling.BILINEAR
+    else:
+        resample = Image.Resampling.LANCZOS
+    
+    return image.resize((new_width, new_height), resample)
 
 
 def image_to_base64(image: Image.Image, format: str = "JPEG") -> str:
     """Convert PIL Image to base64 encoded string."""
     buffered = BytesIO()
     image.save(buffered, format=format)
-    return base64.b64encode(buffered.getvalue()).decode('utf-8')
+    # Encode straight from the buffer's memory rather than a copy of it
+    return base64.b64encode(buffered.getbuffer()).decode('utf-8')
 
 
-def prepare_image_for_model(uploaded_file) -> tuple[Image.Image, str]:
+def prepare_image_for_model(uploaded_file, max_size: int = 1024) -> tuple[Image.Image, str]:
     """
     Prepare uploaded image for model processing.
+    Accepts an uploaded file or an already opened (not yet loaded) PIL Image.
     Returns tuple of (PIL Image, base64 string).
     """
-    image = Image.open(uploaded_file)
+    if isinstance(uploaded_file, Image.Image):
+        image = uploaded_file
+    else:
+        image = Image.open(uploaded_file)
+    
+    # Let the JPEG decoder downscale by a power of two while decoding, so large
+    # photos are never decoded at full resolution (no-op for other formats)
+    image.draft('RGB', (max_size, max_size))
+    
+    # Bring every other kind of transparency (grayscale or palette alpha,
+    # a palette/colour-key transparent entry) to RGBA so it is flattened too
+    if image.mode in ('LA', 'PA') or (image.mode != 'RGBA' and 'transparency' in image.info):
+        image = image.convert('RGBA')
     
-    # Convert to RGB if necessary (handles RGBA, grayscale, etc.)
-    if image.mode != 'RGB':
+    # Convert to RGB if necessary (handles RGBA, grayscale, CMYK, etc.)
+    if image.mode == 'RGBA':
+        alpha = image.getchannel('A')
+        if alpha.getextrema()[0] == 255:
+            # Fully opaque, so the alpha channel can simply be dropped
+            image = image.convert('RGB')
+        else:
+            # Flatten transparent areas onto white instead of their hidden colour
+            background = Image.new('RGB', image.size, (255, 255, 255))
+            background.paste(image, mask=alpha)
+            image = background
+    elif image.mode != 'RGB':
         image = image.convert('RGB')
     
     # Resize for optimal processing
-    image = resize_image_for_api(image)
+    image = resize_image_for_api(image, max_size)
     
     # Get base64 encoding
     b64_string = image_to_base64(image)
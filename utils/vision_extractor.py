@@ -4,24 +4,12 @@ Supports Qwen3-VL via HuggingFace API and GPT-4 Vision via OpenAI API.
 """
 import os
 import re
+import threading
+from typing import Iterator
 from PIL import Image
 from io import BytesIO
 import base64
 
-# Try to import OpenAI
-try:
-    from openai import OpenAI
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
-
-# Try to import huggingface_hub for API inference
-try:
-    from huggingface_hub import InferenceClient
-    HF_HUB_AVAILABLE = True
-except ImportError:
-    HF_HUB_AVAILABLE = False
-
 
 # Available models for selection
 AVAILABLE_MODELS = {
@@ -40,6 +28,33 @@ AVAILABLE_MODELS = {
 }
 
 
+# Instructions sent with every image, asking for the markers DocxGenerator understands
+_EXTRACTION_PROMPT = """You are an expert document analyzer. Extract ALL text from this handwritten image.
+
+Instructions:
+1. Extract all visible handwritten text in reading order (left-to-right, top-to-bottom)
+2. Preserve headings by using ## for main headings and ### for subheadings
+3. Use **bold** for emphasized or underlined text
+4. Use - for bullet points and 1. 2. 3. for numbered lists
+5. For any diagrams or charts, describe them as [DIAGRAM: description]
+6. For mathematical formulas, use $formula$ notation
+7. For tables, use markdown table format
+
+Extract all the text now:"""
+
+
+# Seconds an API request may wait on the provider before failing, so a hung
+# call can't hold a shared scheduler worker indefinitely
+REQUEST_TIMEOUT = 120
+
+# Patterns used by parse_formatting_markers, compiled once
+_NUM_LIST_RE = re.compile(r'^\d+\.\s')
+_NUM_PREFIX_RE = re.compile(r'^\d+\.')
+_DIAGRAM_RE = re.compile(r'\[DIAGRAM:\s*(.*?)\]')
+_BOLD_RE = re.compile(r'\*\*(.*?)\*\*')
+_FORMULA_RE = re.compile(r'\$(.*?)\$')
+
+
 def get_available_models():
     """Return list of available model options for the UI."""
     return list(AVAILABLE_MODELS.keys())
@@ -73,42 +88,41 @@ class VisionExtractor:
         self.client = None
         
         if self.inference_type == "huggingface":
-            if not HF_HUB_AVAILABLE:
-                raise RuntimeError("huggingface_hub not installed. Run: pip install huggingface_hub")
             self._init_huggingface_client()
         elif self.inference_type == "openai":
-            if not OPENAI_AVAILABLE:
-                raise RuntimeError("openai not installed. Run: pip install openai")
             if not self.openai_key:
                 raise RuntimeError("OpenAI API key required. Set OPENAI_API_KEY in secrets.toml")
             self._init_openai_client()
+        
+        # Resolve the backend call once rather than re-dispatching per extraction
+        self._stream_impl = {
+            "huggingface": self._stream_via_huggingface,
+            "openai": self._stream_via_openai,
+        }.get(self.inference_type)
     
     def _init_huggingface_client(self):
         """Initialize HuggingFace Inference API client."""
+        # Imported here so only the backend in use pays its import cost
+        try:
+            from huggingface_hub import InferenceClient
+        except ImportError:
+            raise RuntimeError("huggingface_hub not installed. Run: pip install huggingface_hub")
+        
         self.client = InferenceClient(
             model=self.model_info["id"],
-            token=self.hf_token
+            token=self.hf_token,
+            timeout=REQUEST_TIMEOUT
         )
     
     def _init_openai_client(self):
         """Initialize OpenAI client."""
-        self.client = OpenAI(api_key=self.openai_key)
+        try:
+            from openai import OpenAI
+        except ImportError:
+            raise RuntimeError("openai not installed. Run: pip install openai")
+        
+        self.client = OpenAI(api_key=self.openai_key, timeout=REQUEST_TIMEOUT)
     
-    def _get_extraction_prompt(self) -> str:
-        """Get the prompt for text extraction."""
-        return """You are an expert document analyzer. Extract ALL text from this handwritten image.
-
-Instructions:
-1. Extract all visible handwritten text in reading order (left-to-right, top-to-bottom)
-2. Preserve headings by using ## for main headings and ### for subheadings
-3. Use **bold** for emphasized or underlined text
-4. Use - for bullet points and 1. 2. 3. for numbered lists
-5. For any diagrams or charts, describe them as [DIAGRAM: description]
-6. For mathematical formulas, use $formula$ notation
-7. For tables, use markdown table format
-
-Extract all the text now:"""
-
     def extract_text(self, image: Image.Image) -> str:
         """
         Extract text from an image using the vision model.
@@ -119,96 +133,164 @@ Extract all the text now:"""
         Returns:
             Extracted text with formatting markers
         """
-        if self.inference_type == "huggingface":
-            return self._extract_via_huggingface(image)
-        elif self.inference_type == "openai":
-            return self._extract_via_openai(image)
-        else:
+        return "".join(self.extract_text_stream(image))
+    
+    def extract_text_stream(self, image: Image.Image) -> Iterator[str]:
+        """
+        Extract text from an image, yielding it in pieces as the model produces it.
+        
+        Args:
+            image: PIL Image object
+            
+        Yields:
+            Consecutive chunks of the extracted text with formatting markers
+        """
+        if self._stream_impl is None:
             raise RuntimeError(f"Unknown inference type: {self.inference_type}")
+        
+        # Encode the image and build the request once, whichever backend sends it
+        messages = self._build_messages(self._image_to_data_url(image))
+        yield from self._stream_impl(image, messages)
     
-    def _extract_via_huggingface(self, image: Image.Image) -> str:
-        """Extract text using HuggingFace Inference API."""
-        # Convert image to base64
+    @staticmethod
+    def _image_to_data_url(image: Image.Image) -> str:
+        """Encode an image as a base64 JPEG data URL for the chat APIs."""
         buffered = BytesIO()
         image.save(buffered, format="JPEG")
-        img_base64 = base64.b64encode(buffered.getvalue()).decode('utf-8')
-        
-        prompt = self._get_extraction_prompt()
-        
-        try:
-            # Use chat completion with image
-            response = self.client.chat_completion(
-                messages=[
+        # base64 output is pure ASCII, so the cheaper codec is enough
+        return f"data:image/jpeg;base64,{base64.b64encode(buffered.getbuffer()).decode('ascii')}"
+    
+    @staticmethod
+    def _build_messages(image_url: str) -> list:
+        """Build the chat request asking for the image's text; both APIs take this shape."""
+        return [
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "image_url",
+                        "image_url": {
+                            "url": image_url
+                        }
+                    },
                     {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/jpeg;base64,{img_base64}"
-                                }
-                            },
-                            {
-                                "type": "text",
-                                "text": prompt
-                            }
-                        ]
+                        "type": "text",
+                        "text": _EXTRACTION_PROMPT
                     }
-                ],
-                max_tokens=4096
+                ]
+            }
+        ]
+    
+    @staticmethod
+    def _iter_deltas(stream) -> Iterator[str]:
+        """Yield the non-empty text deltas of a streamed chat completion."""
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    
+    def _stream_via_huggingface(self, image: Image.Image, messages: list) -> Iterator[str]:
+        """Stream extracted text from the HuggingFace Inference API."""
+        streamed = False
+        try:
+            # Use chat completion with image
+            stream = self.client.chat_completion(
+                messages=messages,
+                max_tokens=4096,
+                stream=True
             )
-            return response.choices[0].message.content
+            for text in self._iter_deltas(stream):
+                streamed = True
+                yield text
         except Exception as e:
+            # Part of the text has already been handed out, so a fallback can't replace it
+            if streamed:
+                raise RuntimeError(f"HuggingFace API extraction failed: {str(e)}")
+            
             # If the primary model fails, try alternative approach
             try:
-                # Try image-to-text as fallback
-                buffered.seek(0)
+                # Try image-to-text as fallback, which takes the raw JPEG bytes
+                buffered = BytesIO()
+                image.save(buffered, format="JPEG")
                 result = self.client.image_to_text(buffered.getvalue())
                 if isinstance(result, str):
-                    return result
+                    text = result
                 elif hasattr(result, 'generated_text'):
-                    return result.generated_text
+                    text = result.generated_text
                 else:
-                    return str(result)
+                    text = str(result)
             except Exception as e2:
                 raise RuntimeError(f"HuggingFace API extraction failed: {str(e)}. Fallback also failed: {str(e2)}")
+            yield text
     
-    def _extract_via_openai(self, image: Image.Image) -> str:
-        """Extract text using OpenAI GPT-4 Vision API."""
-        # Convert image to base64
-        buffered = BytesIO()
-        image.save(buffered, format="JPEG")
-        img_base64 = base64.b64encode(buffered.getvalue()).decode('utf-8')
-        
-        prompt = self._get_extraction_prompt()
-        
+    def _stream_via_openai(self, image: Image.Image, messages: list) -> Iterator[str]:
+        """Stream extracted text from the OpenAI GPT-4 Vision API."""
         try:
-            response = self.client.chat.completions.create(
+            stream = self.client.chat.completions.create(
                 model=self.model_info["id"],
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/jpeg;base64,{img_base64}"
-                                }
-                            },
-                            {
-                                "type": "text",
-                                "text": prompt
-                            }
-                        ]
-                    }
-                ],
-                max_tokens=4096
+                messages=messages,
+                max_tokens=4096,
+                stream=True
             )
-            return response.choices[0].message.content
+            yield from self._iter_deltas(stream)
         except Exception as e:
             raise RuntimeError(f"OpenAI GPT-4 Vision extraction failed: {str(e)}")
 
 
+class ExtractorRegistry:
+    """Keep one loaded extractor per model, shared by every caller."""
+    
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._extractors = {}
+        self._errors = {}
+        self._lock = threading.Lock()
+    
+    def get(self, model_key: str, hf_token: str = None, openai_key: str = None):
+        """
+        Return the extractor for a model, loading it on first use.
+        
+        Returns None if the extractor could not be created; the reason is
+        available from get_error until a later call loads it successfully.
+        Failures aren't cached, so every call retries the load.
+        """
+        with self._lock:
+            if model_key in self._extractors:
+                return self._extractors[model_key]
+        
+        # Build outside the lock: client construction includes the backend's
+        # first import, and other callers shouldn't wait on it
+        try:
+            extractor = VisionExtractor(
+                hf_token=hf_token,
+                openai_key=openai_key,
+                model_key=model_key
+            )
+        except Exception as e:
+            with self._lock:
+                self._errors[model_key] = str(e)
+            return None
+        
+        with self._lock:
+            self._errors.pop(model_key, None)
+            # Another caller may have loaded the same model meanwhile; keep theirs
+            return self._extractors.setdefault(model_key, extractor)
+    
+    def peek(self, model_key: str):
+        """Return the extractor for a model if it is already loaded, else None."""
+        with self._lock:
+            return self._extractors.get(model_key)
+    
+    def get_error(self, model_key: str) -> str:
+        """Return the error from the last failed load of a model, if any."""
+        with self._lock:
+            return self._errors.get(model_key)
+    
+    def loaded_models(self) -> list:
+        """Return the keys of loaded extractors, in the order they were loaded."""
+        with self._lock:
+            return list(self._extractors)
+
+
 def parse_formatting_markers(text: str) -> dict:
     """
     Parse extracted text and identify formatting elements.
@@ -233,7 +315,7 @@ def parse_formatting_markers(text: str) -> dict:
         'formulas': []
     }
     
-    lines = text.split('\n')
+    lines = text.splitlines()
     current_table = []
     in_table = False
     
@@ -251,15 +333,15 @@ def parse_formatting_markers(text: str) -> dict:
         elif stripped.startswith('- ') or stripped.startswith('* '):
             result['bullet_points'].append(stripped[2:])
         # Numbered lists
-        elif re.match(r'^\d+\.\s', stripped):
-            result['numbered_lists'].append(re.sub(r'^\d+\.\s', '', stripped))
+        elif _NUM_LIST_RE.match(stripped):
+            result['numbered_lists'].append(_NUM_LIST_RE.sub('', stripped))
         # Diagram markers
         elif '[DIAGRAM:' in stripped:
-            diagram_match = re.search(r'\[DIAGRAM:\s*(.*?)\]', stripped)
+            diagram_match = _DIAGRAM_RE.search(stripped)
             if diagram_match:
                 result['diagrams'].append(diagram_match.group(1))
-        # Table detection
-        elif '|' in stripped and stripped.count('|') >= 2:
+        # Table detection (two or more pipes; the search stops at the second one)
+        elif stripped.find('|', stripped.find('|') + 1) != -1:
             in_table = True
             current_table.append(stripped)
         elif in_table and stripped:
@@ -269,21 +351,16 @@ def parse_formatting_markers(text: str) -> dict:
                 result['tables'].append('\n'.join(current_table))
                 current_table = []
                 in_table = False
-        # Regular paragraphs
-        elif stripped and not any([
-            stripped.startswith('#'),
-            stripped.startswith('-'),
-            stripped.startswith('*'),
-            re.match(r'^\d+\.', stripped),
-            '[DIAGRAM:' in stripped
-        ]):
+        # Regular paragraphs (diagram lines never get here, the branch above takes them)
+        elif stripped and stripped[0] not in '#-*' and not _NUM_PREFIX_RE.match(stripped):
             result['paragraphs'].append(stripped)
         
-        # Always check for inline formatting (bold, formulas) regardless of line type
-        bold_matches = re.findall(r'\*\*(.*?)\*\*', stripped)
-        result['bold_text'].extend(bold_matches)
-        formula_matches = re.findall(r'\$(.*?)\$', stripped)
-        result['formulas'].extend(formula_matches)
+        # Always check for inline formatting (bold, formulas) regardless of line type;
+        # the substring tests skip the regex scan on lines that can't match
+        if '**' in stripped:
+            result['bold_text'].extend(_BOLD_RE.findall(stripped))
+        if '$' in stripped:
+            result['formulas'].extend(_FORMULA_RE.findall(stripped))
     
     # Handle any remaining table
     if current_table: